@@ -1,24 +1,41 @@
 # -*- coding: utf-8 -*- 
 import os
 from dotenv import load_dotenv
-from fastapi import FastAPI, Response, Query, HTTPException
+from fastapi import FastAPI, Request, Response, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta, timezone
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+import httpx
+import asyncio
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
+from cachetools import TTLCache
+from datetime import datetime, date, timedelta, timezone
 from typing import List, Dict, Any, Union
 from pydantic import BaseModel
 import json
+import time
+import logging
+import calendar
+import hashlib
+import orjson
+from operator import itemgetter
+from heapq import merge
 from urllib.parse import unquote
 from typing import Dict, Optional, List
 
 load_dotenv()
 
+# 운영에서는 INFO 레벨로 두어 디버그 로그가 no-op이 되게 함
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
+
 # ===============================================================================
 # 1. 기본 설정 (FastAPI 앱, 미들웨어, 상수)
 # ===============================================================================
 
-app = FastAPI()
+# orjson 기반 직렬화로 응답 JSON 인코딩 비용 절감
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS(Cross-Origin Resource Sharing) 미들웨어 설정
 app.add_middleware(
@@ -29,6 +46,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 1KB 이상 응답은 gzip 압축 (한글 JSON 기준 60~80% 축소)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # 기상청 API 키
 OPENWEATHER_API_KEY = os.getenv('WEATHER_SERVICE_KEY')
 
@@ -50,12 +70,14 @@ LIBRARY_CONFIG = {
     }
 }
 
+# 한국 시간대 (호출마다 timezone 객체를 새로 만들지 않도록 모듈 상수)
+KST = timezone(timedelta(hours=9))
+
 # 요청시간 계산 함수 (초단기실황용)
-def get_base_time():
-    # 한국 시간대 설정
-    kst = timezone(timedelta(hours=9))
-    now = datetime.now(kst)
-    
+def get_base_time(now: Optional[datetime] = None):
+    if now is None:
+        now = datetime.now(KST)
+
     current_hour = now.hour
     current_minute = now.minute
     
@@ -75,11 +97,11 @@ def get_base_time():
     return base_date, base_time
 
 # 단기예보용 base_time 계산 함수
-def get_forecast_base_time():
+def get_forecast_base_time(now: Optional[datetime] = None):
     """단기예보 발표시각 계산 (0200, 0500, 0800, 1100, 1400, 1700, 2000, 2300)"""
-    kst = timezone(timedelta(hours=9))
-    now = datetime.now(kst)
-    
+    if now is None:
+        now = datetime.now(KST)
+
     # 단기예보 발표시각 (1일 8회)
     base_times = [2, 5, 8, 11, 14, 17, 20, 23]
     current_hour = now.hour
@@ -127,131 +149,254 @@ HEADERS = {
 }
 HUFS_DOMAIN = "https://www.hufs.ac.kr"
 
+# 크롤링 대상 URL (요청마다 f-string으로 다시 만들지 않도록 모듈 상수로 고정)
+SCHEDULE_URL = f"{HUFS_DOMAIN}/hufs/11360/subview.do"
+NOTICES_URL_GENERAL = f"{HUFS_DOMAIN}/hufs/11281/subview.do"
+NOTICES_URL_HAKSA = f"{HUFS_DOMAIN}/hufs/11282/subview.do"
+MEAL_API_URLS = {
+    "1": f"{HUFS_DOMAIN}/cafeteria/hufs/1/getMenu.do",
+    "2": f"{HUFS_DOMAIN}/cafeteria/hufs/2/getMenu.do"
+}
+
+# 학사일정 이벤트 매칭 테이블: 학기 키워드 → (개강 저장 키, 종강 저장 키)
+SCHEDULE_EVENT_SLOTS = {
+    '제1학기': ('first_start', 'first_end'),
+    '제2학기': ('second_start', 'second_end')
+}
+# 개강으로 취급하는 보조 키워드
+SCHEDULE_START_KEYWORDS = ('개강', '학기개시일')
+
+# 초단기실황 카테고리 → 응답 필드 매핑
+CURRENT_WEATHER_FIELDS = {
+    'T1H': 'temp',      # 기온
+    'REH': 'humidity',  # 습도
+    'PTY': 'rainType'   # 강수형태
+}
+# 단기예보에서 사용하는 카테고리
+FORECAST_CATEGORIES = frozenset({'SKY', 'TMN', 'TMX'})
+
+# 공지사항 행 선택자 (상단 고정 공지는 제외)
+NOTICE_ROW_SELECTOR = "tbody tr:not(.notice)"
+NOTICE_SUBJECT_SELECTOR = "td.td-subject a"
+NOTICE_DATE_SELECTOR = "td.td-date"
+
+# 학식 메뉴 셀 내부 선택자
+MEAL_PAY_SELECTOR = "p.pay"
+MEAL_LI_SELECTOR = "ul > li"
+MEAL_STRONG_SELECTOR = "strong.point"
+
+# 학사일정 페이지는 콘텐츠 영역만 파싱 (내비게이션 등 나머지 마크업은 건너뜀)
+SCHEDULE_STRAINER = SoupStrainer('div', id='timeTableList')
+
+# 일시적 게이트웨이 오류로 간주해 재시도하는 상태 코드
+_RETRY_STATUS = frozenset({502, 503, 504})
+
+class _RetryTransport(httpx.AsyncHTTPTransport):
+    """502/503/504가 난 GET을 짧은 백오프 후 최대 2회 재시도하는 전송 계층.
+
+    (POST는 본문 재전송 문제가 있어 연결 수준 재시도만 적용)
+    """
+    async def handle_async_request(self, request):
+        response = await super().handle_async_request(request)
+        if request.method != "GET":
+            return response
+        for attempt in range(2):
+            if response.status_code not in _RETRY_STATUS:
+                break
+            await response.aclose()
+            await asyncio.sleep(0.2 * (2 ** attempt))
+            response = await super().handle_async_request(request)
+        return response
+
+# HUFS 서버와의 keep-alive 연결을 재사용하기 위한 공용 비동기 HTTP 클라이언트
+# HTTP/2로 같은 호스트에 가는 동시 요청들을 한 연결에 멀티플렉싱
+http_client = httpx.AsyncClient(
+    transport=_RetryTransport(
+        http2=True,
+        retries=2,  # 연결 수립 실패 재시도
+        limits=httpx.Limits(max_keepalive_connections=4)
+    ),
+    headers=HEADERS,
+    timeout=httpx.Timeout(5.0, connect=2.0)
+)
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.aclose()
+
 # ===============================================================================
 # 2. 크롤링 함수
 # ===============================================================================
 
-def crawl_schedule() -> Dict[str, str]:
+# 크롤 결과 캐시: 학사일정은 수 시간, 공지는 수 분 단위로만 바뀜
+_schedule_cache = TTLCache(maxsize=1, ttl=21600)
+_notice_cache = TTLCache(maxsize=4, ttl=120)
+
+# 업스트림 조건부 GET용 검증자: URL -> (ETag, Last-Modified, 파싱 결과)
+# TTL 만료 후 재크롤 시 페이지가 안 바뀌었으면 304로 본문 전송/재파싱을 건너뜀
+_upstream_validators: Dict[str, tuple] = {}
+
+def _conditional_headers(url: str) -> Dict[str, str]:
+    """이전 응답의 검증자가 있으면 If-None-Match/If-Modified-Since 헤더를 만듭니다."""
+    etag, last_modified, _ = _upstream_validators.get(url, (None, None, None))
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    return headers
+
+def _store_validators(url: str, response, parsed: Any) -> None:
+    """응답에 검증자가 있으면 파싱 결과와 함께 저장해 다음 재검증에 사용합니다."""
+    etag = response.headers.get('etag')
+    last_modified = response.headers.get('last-modified')
+    if etag or last_modified:
+        _upstream_validators[url] = (etag, last_modified, parsed)
+
+async def crawl_schedule() -> Dict[str, str]:
     """HUFS 웹사이트에서 학사일정을 크롤링합니다."""
+    cached = _schedule_cache.get('schedule')
+    if cached is not None:
+        return cached
+
     try:
         # 학사일정 페이지 URL로 직접 접속하도록 수정
-        schedule_url = f"{HUFS_DOMAIN}/hufs/11360/subview.do"
-        schedule_response = requests.get(schedule_url, headers=HEADERS, timeout=5)
+        schedule_response = await http_client.get(
+            SCHEDULE_URL, headers=_conditional_headers(SCHEDULE_URL))
+        if schedule_response.status_code == 304:
+            # 페이지 미변경: 마지막 파싱 결과 재사용
+            schedule_dates = _upstream_validators[SCHEDULE_URL][2]
+            _schedule_cache['schedule'] = schedule_dates
+            return schedule_dates
         schedule_response.raise_for_status()
         
-        schedule_soup = BeautifulSoup(schedule_response.text, 'html.parser')
-        
+        # 가장 무거운 파싱이므로 이벤트 루프를 막지 않도록 스레드로 넘김
+        schedule_soup = await asyncio.to_thread(
+            BeautifulSoup, schedule_response.content, 'lxml',
+            parse_only=SCHEDULE_STRAINER, from_encoding='utf-8')
+
         # 이전에 수정한 내용(콘텐츠 영역 선택자)이 반영된 부분
         content_wrap = schedule_soup.find('div', id='timeTableList')
         if not content_wrap:
             raise ValueError("학사일정 콘텐츠 영역을 찾을 수 없습니다.")
         
         schedule_dates = _extract_schedule_dates(content_wrap.find_all('li'))
-        print("Crawled schedule:", schedule_dates)
+        logger.debug("Crawled schedule: %s", schedule_dates)
+        _schedule_cache['schedule'] = schedule_dates
+        _store_validators(SCHEDULE_URL, schedule_response, schedule_dates)
         return schedule_dates
 
     except Exception as e:
-        print("Error crawling schedule:", str(e))
+        logger.error("Error crawling schedule: %s", e)
         return {}
 
 def _extract_schedule_dates(items: List[Any]) -> Dict[str, str]:
     """학사일정 HTML 리스트에서 주요 일정(개강, 종강)의 날짜를 추출합니다."""
+    # 찾는 일정은 학기별 개강/종강 4개뿐 — 다 채우면 나머지 항목은 건너뜀
+    target_count = sum(len(slots) for slots in SCHEDULE_EVENT_SLOTS.values())
     schedule_dates = {}
     for item in items:
-        date_elems = item.find_all('p', class_='list-date')
-        event_elems = item.find_all('p', class_='list-content')
-        for date, event in zip(date_elems, event_elems):
-            date_text = date.get_text(strip=True)
+        if len(schedule_dates) == target_count:
+            break
+        # 한 번의 서브트리 순회로 날짜/내용 <p>를 동시에 수집
+        date_elems, event_elems = [], []
+        for p in item.find_all('p', class_=['list-date', 'list-content']):
+            (date_elems if 'list-date' in p.get('class', []) else event_elems).append(p)
+        for date_p, event in zip(date_elems, event_elems):
+            date_text = date_p.get_text(strip=True)
             event_str = event.get_text(strip=True)
             
             date_parts = [d.strip() for d in date_text.split('~')]
             first_date = date_parts[0]
             last_date = date_parts[-1]
             
-            if '제1학기' in event_str and ('개강' in event_str or '학기개시일' in event_str): 
-                schedule_dates['first_start'] = first_date
-            elif '제1학기 기말시험' in event_str: 
-                schedule_dates['first_end'] = last_date
-            elif '제2학기' in event_str and ('개강' in event_str or '학기개시일' in event_str): 
-                schedule_dates['second_start'] = first_date
-            elif '제2학기 기말시험' in event_str:
-                schedule_dates['second_end'] = last_date
+            # if/elif 체인 대신 매핑 테이블 기반으로 이벤트 분류
+            for sem_key, (start_slot, end_slot) in SCHEDULE_EVENT_SLOTS.items():
+                if sem_key not in event_str:
+                    continue
+                if f"{sem_key} 기말시험" in event_str:
+                    schedule_dates[end_slot] = last_date
+                elif any(k in event_str for k in SCHEDULE_START_KEYWORDS):
+                    schedule_dates[start_slot] = first_date
+                break
     return schedule_dates
 
-def crawl_notices(url: str) -> List[Dict[str, str]]:
+async def crawl_notices(url: str) -> List[Dict[str, str]]:
     """HUFS 웹사이트에서 일반 또는 학사 공지사항을 크롤링합니다."""
+    cached = _notice_cache.get(url)
+    if cached is not None:
+        return cached
+
     try:
-        response = requests.get(url, headers=HEADERS, timeout=5)
+        response = await http_client.get(url, headers=_conditional_headers(url))
+        if response.status_code == 304:
+            # 게시판 미변경: 마지막 파싱 결과 재사용
+            notices = _upstream_validators[url][2]
+            _notice_cache[url] = notices
+            return notices
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        notice_rows = soup.select("tbody tr:not(.notice)")
-        
+        tree = LexborHTMLParser(response.content)
+        # 상위 10건만 쓰므로 순회 전에 잘라냄
+        notice_rows = tree.css(NOTICE_ROW_SELECTOR)[:10]
+
         notices = []
-        for row in notice_rows[:10]:
-            title_td = row.find('td', class_='td-subject')
-            date_td = row.find('td', class_='td-date')
-            if not (title_td and date_td and title_td.find('a')): continue
+        domain = HUFS_DOMAIN  # 루프 내 전역 이름 조회를 지역 변수로
+        for row in notice_rows:
+            a_tag = row.css_first(NOTICE_SUBJECT_SELECTOR)
+            date_td = row.css_first(NOTICE_DATE_SELECTOR)
+            if not (a_tag and date_td): continue
 
-            a_tag = title_td.find('a')
-            link = a_tag['href']
-            date = date_td.get_text(strip=True)
+            link = a_tag.attributes.get('href', '')
+            date = date_td.text(strip=True)
 
             # <strong> 태그에서 제목 추출
-            strong_tag = a_tag.find('strong')
-            title = strong_tag.get_text(strip=True) if strong_tag else a_tag.get_text(strip=True)
+            strong_tag = a_tag.css_first('strong')
+            title = strong_tag.text(strip=True) if strong_tag else a_tag.text(strip=True)
 
             # "new" 클래스를 가진 <span> 태그 확인 후 " (NEW)" 추가
-            if a_tag.find('span', class_='new'):
+            if a_tag.css_first('span.new'):
                 title += " (NEW)"
             
-            notices.append({'date': date, 'title': title, 'link': HUFS_DOMAIN + link})
-        print("Crawled notices from", url, ":", notices)
+            notices.append({'date': date, 'title': title, 'link': domain + link})
+        logger.debug("Crawled notices from %s: %s", url, notices)
+        _notice_cache[url] = notices
+        _store_validators(url, response, notices)
         return notices
     except Exception as e:
-        print("Error crawling notices from", url, ":", str(e))
+        logger.error("Error crawling notices from %s: %s", url, e)
         return []
 
-def _crawl_meals_by_campus(campus_path: str) -> List[Dict[str, Any]]:
+# 학식 메뉴는 주 단위로만 바뀌므로 파싱 결과를 프로세스 내에서 재사용
+_meal_cache = TTLCache(maxsize=8, ttl=3600)
+
+async def _crawl_meals_by_campus(campus_path: str) -> List[Dict[str, Any]]:
     """HUFS 학식 API를 호출하여 이번 주 학식 메뉴를 가져옵니다."""
-    print(f"\n\n[!!!] Attempting to crawl meals for campus_path: {campus_path} [!!!]\n\n")
+    today = date.today()
+
+    # 식단은 주 단위로 게시되므로 ISO 주차를 키로 사용 (주 경계에서 자연스럽게 롤오버,
+    # 주중 정정 반영은 TTL이 담당)
+    iso_year, iso_week, _ = today.isocalendar()
+    cache_key = (campus_path, iso_year, iso_week)
+    cached = _meal_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    logger.debug("Attempting to crawl meals for campus_path: %s", campus_path)
     try:
-        today = datetime.now()
-        # 식당 페이지와 동일하게 월요일~토요일 범위로 계산
-        start_of_week = today - timedelta(days=today.weekday())  # 월요일
-        end_of_week = start_of_week + timedelta(days=5)  # 토요일
+        # 식당 페이지와 동일하게 월요일~토요일 범위로 계산 (ordinal 정수 산술)
+        start_ord = today.toordinal() - today.weekday()
+        start_of_week = date.fromordinal(start_ord)  # 월요일
+        end_of_week = date.fromordinal(start_ord + 5)  # 토요일
 
         # 캠퍼스별 식당 ID 설정
         caf_id = "h101" if campus_path == "1" else "h203"
 
         # 홈페이지는 현재 주의 같은 달 내 범위를 사용하는 것 같음
         # 예: 현재 주가 12월 28일(토) ~ 1월 3일(금)이면, 12월 28일~31일만 사용
-        if start_of_week.month == today.month and end_of_week.month == today.month:
-            # 주 전체가 같은 달이면 그대로 사용
-            week_first_day = start_of_week.day
-            week_last_day = end_of_week.day
-        elif start_of_week.month == today.month:
-            # 주 시작일은 현재 달, 끝일은 다음 달
-            # 현재 달의 마지막 날까지 사용
-            if today.month == 12:
-                next_month = datetime(today.year + 1, 1, 1)
-            else:
-                next_month = datetime(today.year, today.month + 1, 1)
-            week_first_day = start_of_week.day
-            week_last_day = (next_month - timedelta(days=1)).day
-        elif end_of_week.month == today.month:
-            # 주 시작일은 이전 달, 끝일은 현재 달
-            # 현재 달의 1일부터 끝일까지 사용
-            week_first_day = 1
-            week_last_day = end_of_week.day
-        else:
-            # 주 전체가 다른 달 (현재 달이 중간에 있음)
-            # 현재 달의 전체 범위 사용
-            week_first_day = 1
-            if today.month == 12:
-                next_month = datetime(today.year + 1, 1, 1)
-            else:
-                next_month = datetime(today.year, today.month + 1, 1)
-            week_last_day = (next_month - timedelta(days=1)).day
+        # 주 시작/끝이 현재 달을 벗어나면 1일 또는 달의 마지막 날로 클램프
+        month_last_day = calendar.monthrange(today.year, today.month)[1]
+        week_first_day = start_of_week.day if start_of_week.month == today.month else 1
+        week_last_day = end_of_week.day if end_of_week.month == today.month else month_last_day
 
         payload = {
             "selCafId": caf_id,
@@ -262,134 +407,220 @@ def _crawl_meals_by_campus(campus_path: str) -> List[Dict[str, Any]]:
         }
 
         # 디버깅: 생성된 파라미터 출력
-        print(f"[DEBUG] Meal crawling parameters:")
-        print(f"  - today: {today.strftime('%Y-%m-%d (%A)')}")
-        print(f"  - start_of_week: {start_of_week.strftime('%Y-%m-%d (%A)')}")
-        print(f"  - end_of_week: {end_of_week.strftime('%Y-%m-%d (%A)')}")
-        print(f"  - week_first_day: {week_first_day}")
-        print(f"  - week_last_day: {week_last_day}")
-        print(f"  - payload: {payload}")
-
-        api_url = f"https://www.hufs.ac.kr/cafeteria/hufs/{campus_path}/getMenu.do"
-        response = requests.post(api_url, data=payload, headers=HEADERS, timeout=5)
+        logger.debug("Meal crawl window %s ~ %s, payload: %s",
+                     start_of_week, end_of_week, payload)
+
+        response = await http_client.post(MEAL_API_URLS[campus_path], data=payload)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        meal_rows = soup.find_all('tr')
-        
+        tree = LexborHTMLParser(response.content)
+        meal_rows = tree.css('tr')
+
         meals = []
         for row in meal_rows:
-            th = row.find('th')
-            tds = row.find_all('td')
+            th = row.css_first('th')
+            tds = row.css('td')
             if not th or not tds: continue
 
-            meal_time = th.get_text(strip=True)
-            print(f"\n[Debug] Processing meal time: '{meal_time}'")
+            meal_time = th.text(strip=True)
             menus = []
             for td in tds:
-                pay_tag = td.find('p', class_='pay')
+                pay_tag = td.css_first(MEAL_PAY_SELECTOR)
+                price = pay_tag.text(strip=True) if pay_tag else ''
                 menu_name = ""
 
+                # <li> 목록은 td당 한 번만 조회하고 이후 분기는 그 결과를 재사용
+                lis = td.css(MEAL_LI_SELECTOR)
+                first_strong = lis[0].css_first(MEAL_STRONG_SELECTOR) if lis else None
+
                 # 글로벌캠퍼스 '이벤트 데이' 특별 처리
-                event_day_tag = td.select_one('ul > li:nth-child(1) > strong.point')
-                if campus_path == "2" and event_day_tag and "** 이벤트 데이 **" in event_day_tag.get_text(strip=True):
+                if campus_path == "2" and first_strong and "** 이벤트 데이 **" in first_strong.text(strip=True):
                     # 이벤트 데이는 두 번째 li에 strong 태그 없이 메뉴가 있음
-                    event_menu_li = td.select_one('ul > li:nth-child(2)')
-                    if event_menu_li:
-                        menu_name = event_menu_li.get_text(separator='\n', strip=True)
-                else:
-                    # 일반적인 경우 (기존 로직)
-                    menu_items_li = td.select('ul > li')
-                    if menu_items_li:
-                        # strong.point 태그가 없을 때를 대비해 li 텍스트 전체를 폴백으로 사용
-                        strong_texts = [s.get_text(strip=True) for s in td.select('ul > li > strong.point')]
-                        if strong_texts:
-                            menu_name = '\n'.join(strong_texts)
-                        else:
-                            menu_name = '\n'.join(li.get_text(separator=' ', strip=True) for li in menu_items_li)
+                    if len(lis) > 1:
+                        menu_name = lis[1].text(separator='\n', strip=True)
+                elif lis:
+                    # strong.point 태그가 없을 때를 대비해 li 텍스트 전체를 폴백으로 사용
+                    strong_texts = [s.text(strip=True)
+                                    for s in (li.css_first(MEAL_STRONG_SELECTOR) for li in lis) if s]
+                    if strong_texts:
+                        menu_name = '\n'.join(strong_texts)
                     else:
-                        # ul > li 구조가 없는 경우를 위한 폴백
-                        if pay_tag: pay_tag.decompose()
-                        menu_name = td.get_text(separator='\n', strip=True)
-
-                price = pay_tag.get_text(strip=True) if pay_tag else ''
+                        menu_name = '\n'.join(li.text(separator=' ', strip=True) for li in lis)
+                else:
+                    # ul > li 구조가 없는 경우를 위한 폴백
+                    # 가격은 이미 추출했으므로 p.pay 서브트리를 통째로 제거해
+                    # 여러 노드로 쪼개진 가격 텍스트 조각이 메뉴에 새지 않게 함
+                    if pay_tag:
+                        pay_tag.decompose()
+                    lines = td.text(separator='\n', strip=True).split('\n')
+                    menu_name = '\n'.join(l for l in lines if l)
                 
                 # 서울캠퍼스 조식에서 "방학중에는"을 "방학"으로 처리
                 if campus_path == "1" and "조식" in meal_time and "방학중에는" in menu_name:
                     menu_name = "방학"
-                    print(f"  > [Seoul Campus Breakfast] Replaced '방학중에는' with '방학'")
-                
-                print(f"  > Found menu for one day: '{menu_name.strip()}'")
 
                 # 메뉴가 없는 경우 제외
                 if "등록된 메뉴가" in menu_name or not menu_name.strip():
-                    print(f"    - Skipping: Menu is empty or marked as not registered.")
                     continue
-                
+
                 menus.append({"name": menu_name, "price": price})
-                print(f"    - Success: Added to the list for '{meal_time}'.")
-            
+
             meals.append({'time': meal_time, 'menus': menus})
-        print(f"Crawled meals for campus {campus_path}:", meals)
+        logger.debug("Crawled meals for campus %s: %s", campus_path, meals)
+        _meal_cache[cache_key] = meals
         return meals
     except Exception as e:
-        print(f"Error crawling meals for campus {campus_path}:", str(e))
+        logger.error("Error crawling meals for campus %s: %s", campus_path, e)
         return []
 
-def crawl_meals() -> List[Dict[str, Any]]:
+async def crawl_meals() -> List[Dict[str, Any]]:
     """인문캠퍼스 학식 메뉴를 크롤링합니다."""
-    return _crawl_meals_by_campus("1")
+    return await _crawl_meals_by_campus("1")
 
-def crawl_global_meals() -> List[Dict[str, Any]]:
+async def crawl_global_meals() -> List[Dict[str, Any]]:
     """글로벌캠퍼스 학식 메뉴를 크롤링합니다."""
-    return _crawl_meals_by_campus("2")
+    return await _crawl_meals_by_campus("2")
 
 
 def _debug_print_meals(campus_label: str, meals: List[Dict[str, Any]]) -> None:
-    """학식 목록을 콘솔에 보기 좋게 출력합니다."""
-    print(f"\n--- Meal debug ({campus_label}) ---")
+    """학식 목록을 디버그 로그로 보기 좋게 출력합니다."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("--- Meal debug (%s) ---", campus_label)
     if not meals:
-        print("No meals found.")
+        logger.debug("No meals found.")
         return
     for meal in meals:
-        print(f"[{meal.get('time')}]")
+        logger.debug("[%s]", meal.get('time'))
         if not meal.get('menus'):
-            print("  - (empty)")
+            logger.debug("  - (empty)")
             continue
         for idx, item in enumerate(meal['menus'], start=1):
             name = item.get('name', '').replace('\n', ' | ')
             price = item.get('price', '')
-            print(f"  {idx}. {name} ({price})")
-    print("--- End meal debug ---\n")
+            logger.debug("  %d. %s (%s)", idx, name, price)
+    logger.debug("--- End meal debug ---")
 
 
 
 
 # ===============================================================================
-# 3. API 엔드포인트
+# 3. 서버사이드 응답 캐시
 # ===============================================================================
 
-def _get_common_data():
-    """공통 데이터(학사일정, 공지사항)를 크롤링하고 정렬합니다."""
-    schedule = crawl_schedule()
-    general_notices = crawl_notices(url="https://www.hufs.ac.kr/hufs/11281/subview.do")
-    haksa_notices = crawl_notices(url="https://www.hufs.ac.kr/hufs/11282/subview.do")
+# REDIS_URL이 설정돼 있으면 Redis를, 없으면 프로세스 메모리를 캐시로 사용
+REDIS_URL = os.getenv('REDIS_URL')
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+_redis = aioredis.from_url(REDIS_URL, decode_responses=True) if (aioredis and REDIS_URL) else None
+
+# key -> (신선 만료 시각, stale 만료 시각, 값)
+_local_cache: Dict[str, Any] = {}
+
+async def _cache_get(key: str):
+    """캐시를 조회해 (신선 여부, 저장된 값)을 반환합니다. 없으면 (False, None)."""
+    if _redis is not None:
+        raw = await _redis.get(f"hufs:{key}")
+        if raw is not None:
+            return True, json.loads(raw)
+        raw = await _redis.get(f"hufs:stale:{key}")
+        if raw is not None:
+            return False, json.loads(raw)
+        return False, None
+
+    entry = _local_cache.get(key)
+    if entry:
+        fresh_until, stale_until, value = entry
+        now = time.monotonic()
+        if now < fresh_until:
+            return True, value
+        if now < stale_until:
+            return False, value
+    return False, None
+
+async def _cache_set(key: str, value: Any, ttl: int, stale_ttl: int):
+    """값을 신선 TTL과 stale 폴백 TTL 두 단계로 저장합니다."""
+    if _redis is not None:
+        body = json.dumps(value, ensure_ascii=False)
+        await _redis.setex(f"hufs:{key}", ttl, body)
+        await _redis.setex(f"hufs:stale:{key}", stale_ttl, body)
+    else:
+        now = time.monotonic()
+        _local_cache[key] = (now + ttl, now + stale_ttl, value)
 
-    all_notices = sorted(
-        general_notices + haksa_notices,
-        key=lambda x: x.get('date', '0000-00-00'),
-        reverse=True
-    )
-    return schedule, all_notices
+# 키별 갱신 락: 같은 키의 동시 캐시 미스가 한 번의 fetch로 수렴하게 함
+_inflight_locks: Dict[str, asyncio.Lock] = {}
 
-@app.get("/api/data")
-def get_all_data(response: Response):
-    """인문캠퍼스 데이터를 반환합니다."""
-    response.headers["Cache-Control"] = "public, s-maxage=60, stale-while-revalidate=60"
-    schedule, all_notices = _get_common_data()
-    meals = crawl_meals()
-    _debug_print_meals("Humanities", meals)
+async def _refresh_key(key: str, fetch, ttl: int, stale_ttl: int):
+    """만료된 키를 백그라운드에서 갱신합니다. 키당 갱신은 최대 한 번만 돕니다."""
+    lock = _inflight_locks.setdefault(key, asyncio.Lock())
+    if lock.locked():
+        return
+    async with lock:
+        fresh, _ = await _cache_get(key)
+        if fresh:
+            return
+        try:
+            value = await fetch()
+        except Exception as e:
+            logger.error("Background refresh for %s failed: %s", key, e)
+            return
+        await _cache_set(key, value, ttl, stale_ttl)
+
+async def _fetch_cached(key: str, fetch, ttl: int, stale_ttl: int):
+    """캐시 히트 시 저장된 응답을 바로 반환하고, 미스 시 fetch를 실행해 저장합니다.
+
+    만료됐지만 stale 항목이 남아 있으면 그걸 즉시 반환하고 백그라운드에서
+    한 번만 갱신합니다(stale-while-revalidate). 요청 지연이 업스트림 지연과
+    분리되고, 만료 직후의 thundering herd도 fetch 한 번으로 수렴합니다.
+    """
+    fresh, cached = await _cache_get(key)
+    if fresh:
+        return cached
+    if cached is not None:
+        asyncio.create_task(_refresh_key(key, fetch, ttl, stale_ttl))
+        return cached
+    # 콜드 스타트: 값이 아예 없으면 락 안에서 직접 가져옴 (동시 미스는 대기 후 재조회)
+    lock = _inflight_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        fresh, cached = await _cache_get(key)
+        if fresh or cached is not None:
+            return cached
+        value = await fetch()
+        await _cache_set(key, value, ttl, stale_ttl)
+        return value
 
+# ===============================================================================
+# 4. API 엔드포인트
+# ===============================================================================
+
+# 엔드포인트별 Cache-Control 정책 (요청마다 문자열을 새로 만들지 않도록 상수화)
+# s-maxage: CDN 캐시 시간 / stale-while-revalidate: 만료 후 옛 응답을 주며 백그라운드 갱신
+# stale-if-error: 오리진(HUFS 크롤) 장애 시 CDN이 옛 응답으로 버텨주는 시간
+DATA_CACHE_CONTROL = "public, s-maxage=60, stale-while-revalidate=60, stale-if-error=600"
+LIBRARY_CACHE_CONTROL = "s-maxage=60, stale-while-revalidate=60, stale-if-error=300"
+
+def _etag_response(payload: Any, request: Request, cache_control: str) -> Response:
+    """payload를 orjson으로 직렬화하고 ETag 기반 304 협상을 수행합니다.
+
+    클라이언트가 보낸 If-None-Match가 현재 본문 해시와 같으면
+    본문 전송 없이 304로 응답합니다.
+    """
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _build_campus_data(meal_crawler, campus_label: str) -> Dict[str, Any]:
+    """한 캠퍼스 분량의 공통 데이터 + 학식 페이로드를 생성합니다."""
+    (schedule, all_notices), meals = await asyncio.gather(_get_common_data(), meal_crawler())
+    _debug_print_meals(campus_label, meals)
     return {
         "schedule": schedule,
         "notices": all_notices,
@@ -397,105 +628,157 @@ def get_all_data(response: Response):
         "timestamp": datetime.now().isoformat()
     }
 
+# 백그라운드 주기 갱신 간격 (초)
+REFRESH_INTERVAL = int(os.getenv('REFRESH_INTERVAL', '300'))
+
+async def _refresh_all():
+    """두 캠퍼스의 데이터 페이로드를 미리 크롤링해 캐시에 채워 넣습니다."""
+    seoul, global_ = await asyncio.gather(
+        _build_campus_data(crawl_meals, "Humanities"),
+        _build_campus_data(crawl_global_meals, "Global")
+    )
+    await _cache_set("data:seoul", seoul, ttl=REFRESH_INTERVAL + 60, stale_ttl=3600)
+    await _cache_set("data:global", global_, ttl=REFRESH_INTERVAL + 60, stale_ttl=3600)
+
+async def _refresh_loop():
+    while True:
+        try:
+            await _refresh_all()
+        except Exception as e:
+            logger.error("Background refresh failed: %s", e)
+        await asyncio.sleep(REFRESH_INTERVAL)
+
+@app.on_event("startup")
+async def start_refresh_loop():
+    # 상주 서버에서는 요청 경로가 캐시 조회 + 직렬화만으로 끝난다.
+    # (서버리스처럼 인스턴스 수명이 짧은 환경에서는 기존 온디맨드 크롤이 폴백)
+    asyncio.create_task(_refresh_loop())
+
+async def _get_common_data():
+    """공통 데이터(학사일정, 공지사항)를 동시에 크롤링하고 정렬합니다."""
+    schedule, general_notices, haksa_notices = await asyncio.gather(
+        crawl_schedule(),
+        crawl_notices(url=NOTICES_URL_GENERAL),
+        crawl_notices(url=NOTICES_URL_HAKSA)
+    )
+
+    # 한쪽이 비어 있으면(크롤 실패 등) 합칠 것이 없으므로 정렬 생략
+    if not general_notices or not haksa_notices:
+        return schedule, general_notices or haksa_notices
+
+    # 각 게시판은 이미 날짜 내림차순이므로 O(N) 병합이면 충분
+    all_notices = list(merge(general_notices, haksa_notices,
+                             key=itemgetter('date'), reverse=True))
+    return schedule, all_notices
+
+async def _campus_data_response(request: Request, cache_key: str,
+                                meal_crawler, campus_label: str) -> Response:
+    """캠퍼스 데이터 응답 생성 공통 경로 (두 데이터 엔드포인트에서 공유)."""
+    async def fetch():
+        return await _build_campus_data(meal_crawler, campus_label)
+
+    payload = await _fetch_cached(cache_key, fetch, ttl=60, stale_ttl=600)
+    return _etag_response(payload, request, DATA_CACHE_CONTROL)
+
+@app.get("/api/data")
+async def get_all_data(request: Request):
+    """인문캠퍼스 데이터를 반환합니다."""
+    return await _campus_data_response(request, "data:seoul", crawl_meals, "Humanities")
+
 @app.get('/api/global/data')
-def get_global_data(response: Response):
+async def get_global_data(request: Request):
     """글로벌캠퍼스 데이터를 반환합니다."""
-    response.headers["Cache-Control"] = "public, s-maxage=60, stale-while-revalidate=60"
-    schedule, all_notices = _get_common_data()
-    meals = crawl_global_meals()
-    _debug_print_meals("Global", meals)
-
-    data_to_return = {
-        "schedule": schedule,
-        "notices": all_notices,
-        "meals": meals,
-        "timestamp": datetime.now().isoformat()
-    }
-    
-    print("--- Crawled data for /api/global/data ---")
-    print(data_to_return)
-    print("------------------------------------------")
-    
-    return data_to_return
+    return await _campus_data_response(request, "data:global", crawl_global_meals, "Global")
 
 
 @app.get("/api/library")
-def get_library_seats(response: Response, campus: str = Query("SEOUL")): # 1. response 객체 받기
+async def get_library_seats(request: Request, campus: str = Query("SEOUL")):
 
-    # 캐시 시간 1분
-    # s-maxage=60: 1분 동안은 저장된 거 보여줌 (학교 서버 보호)
-    # stale-while-revalidate=60: 1분 지났으면 1분 더 옛날 거 보여주고 뒤에서 갱신
-    response.headers["Cache-Control"] = "s-maxage=60, stale-while-revalidate=60"
-
-    config = LIBRARY_CONFIG.get(campus.upper(), LIBRARY_CONFIG['SEOUL'])
+    # get_weather와 같은 방식으로 정규화: 미지원 값은 SEOUL로 수렴시켜
+    # 캐시 키/락이 쿼리 문자열 가짓수만큼 늘어나지 않게 함
+    campus_key = campus.upper() if campus.upper() in LIBRARY_CONFIG else 'SEOUL'
+    config = LIBRARY_CONFIG[campus_key]
     url = f"https://lib.hufs.ac.kr/pyxis-api/{config['api_path']}/seat-rooms?smufMethodCode=PC&roomTypeId=2&branchGroupId={config['branch_group_id']}"
-    
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 ..." 
-        }
-        response_data = requests.get(url, headers=headers, timeout=10) # 변수명 겹치지 않게 response -> response_data로 변경
-        data = response_data.json()
-        data['campus'] = campus.upper()
+
+    async def fetch():
+        # User-Agent 등 공통 헤더는 공용 클라이언트 기본값을 그대로 사용
+        response_data = await http_client.get(url, timeout=10) # 변수명 겹치지 않게 response -> response_data로 변경
+        data = orjson.loads(response_data.content)
+        data['campus'] = campus_key
 
         return data
 
+    try:
+        # 좌석 현황은 빨리 바뀌므로 짧은 TTL 사용
+        data = await _fetch_cached(f"library:{campus_key}", fetch, ttl=30, stale_ttl=120)
+        return _etag_response(data, request, LIBRARY_CACHE_CONTROL)
+
     except Exception as e:
         return {"success" : False, "message": str(e)}
 
 @app.get("/api/weather")
-def get_weather(campus: str = Query("SEOUL")):
+async def get_weather(campus: str = Query("SEOUL")):
     """날씨 정보를 반환합니다."""
-    axis = CAMPUS_AXIS.get(campus, CAMPUS_AXIS['SEOUL'])
+    campus_key = campus if campus in CAMPUS_AXIS else 'SEOUL'
+    axis = CAMPUS_AXIS[campus_key]
     nx = axis['nx']
     ny = axis['ny']
 
-    # 초단기실황용 base_time
-    base_date, base_time = get_base_time()
-    
-    # 단기예보용 base_time (오늘의 최저/최고 기온을 위해 전날 23:00 발표분 사용)
-    kst = timezone(timedelta(hours=9))
-    now = datetime.now(kst)
-    # 항상 전날 23:00 발표분을 사용하여 오늘의 최고/최저 기온을 얻음
-    forecast_date = (now - timedelta(days=1)).strftime('%Y%m%d')
-    forecast_time = "2300"
+    async def fetch():
+        # 요청 전체에서 같은 '현재 시각'을 공유 (자정 부근 날짜 어긋남 방지)
+        now = datetime.now(KST)
+
+        # 초단기실황용 base_time
+        base_date, base_time = get_base_time(now)
+
+        # 단기예보용 base_time (오늘의 최저/최고 기온을 위해 전날 23:00 발표분 사용)
+        # 항상 전날 23:00 발표분을 사용하여 오늘의 최고/최저 기온을 얻음
+        forecast_date = (now - timedelta(days=1)).strftime('%Y%m%d')
+        forecast_time = "2300"
     
-    url_current = 'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst'
-    url_forecast = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
-
-    # 초단기실황 파라미터
-    params_current = {
-        'serviceKey': OPENWEATHER_API_KEY,
-        'pageNo': '1',
-        'numOfRows': '1000',
-        'dataType': 'JSON',
-        'base_date': base_date,
-        'base_time': base_time,
-        'nx': nx,
-        'ny': ny
-    }
+        url_current = 'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst'
+        url_forecast = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+
+        # 초단기실황 파라미터
+        # 실황은 기준시각당 카테고리별 1행(총 8행)뿐이므로 10행이면 충분
+        params_current = {
+            'serviceKey': OPENWEATHER_API_KEY,
+            'pageNo': '1',
+            'numOfRows': '10',
+            'dataType': 'JSON',
+            'base_date': base_date,
+            'base_time': base_time,
+            'nx': nx,
+            'ny': ny
+        }
     
-    # 단기예보 파라미터
-    params_forecast = {
-        'serviceKey': OPENWEATHER_API_KEY,
-        'pageNo': '1',
-        'numOfRows': '1000',
-        'dataType': 'JSON',
-        'base_date': forecast_date,
-        'base_time': forecast_time,
-        'nx': nx,
-        'ny': ny
-    }
+        # 단기예보 파라미터
+        # 23:00 발표분 기준 TMN/TMX 대상 날짜(내일)의 15:00 행은 40시간+ 뒤(약 480행)라
+        # numOfRows를 더 줄이면 최저/최고 기온 행이 잘려 나감 → 1000 유지
+        params_forecast = {
+            'serviceKey': OPENWEATHER_API_KEY,
+            'pageNo': '1',
+            'numOfRows': '1000',
+            'dataType': 'JSON',
+            'base_date': forecast_date,
+            'base_time': forecast_time,
+            'nx': nx,
+            'ny': ny
+        }
 
-    try:
-        # 초단기실황 API 호출
-        response_current = requests.get(url_current, params=params_current, timeout=15)
+        # 초단기실황 + 단기예보 API를 동시에 호출 (독립적이므로 대기시간이 겹침)
+        response_current, response_forecast = await asyncio.gather(
+            http_client.get(url_current, params=params_current, timeout=15),
+            http_client.get(url_forecast, params=params_forecast, timeout=15)
+        )
         response_current.raise_for_status()
 
-        # 디버깅: 실제 응답 텍스트 확인
-        print(f"[DEBUG] Current Weather API Raw Response: {response_current.text}")
+        # 디버깅: 실제 응답 텍스트 확인 (DEBUG 레벨일 때만 디코드)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Current Weather API Raw Response: %s", response_current.text)
         
-        data_current = response_current.json()
+        # orjson으로 바이트를 바로 파싱 (텍스트 디코드 단계 생략)
+        data_current = orjson.loads(response_current.content)
         
         # 응답 구조 검증
         if 'response' not in data_current or 'body' not in data_current['response']:
@@ -519,102 +802,116 @@ def get_weather(campus: str = Query("SEOUL")):
             "tmx": "-"       # 최고기온
         }
         
-        # 초단기실황 데이터 파싱
+        # 초단기실황 데이터 파싱 (카테고리 → 필드 딕셔너리 디스패치)
         for item in items_current:
-            if item['category'] == 'T1H': # 기온
-                result['temp'] = item['obsrValue']
-            elif item['category'] == 'REH': # 습도
-                result['humidity'] = item['obsrValue']
-            elif item['category'] == 'PTY': # 강수형태
-                result['rainType'] = item['obsrValue']
+            field = CURRENT_WEATHER_FIELDS.get(item['category'])
+            if field:
+                result[field] = item['obsrValue']
         
-        # 단기예보 API 호출
-        response_forecast = requests.get(url_forecast, params=params_forecast, timeout=15)
-        response_forecast.raise_for_status()
+        # 단기예보 파싱은 별도로 감싸서, 실패해도 초단기실황 결과는 그대로 반환
+        try:
+            # 단기예보 응답 (위에서 이미 동시 요청됨)
+            response_forecast.raise_for_status()
 
-        # 디버깅: 실제 응답 텍스트 확인
-        print(f"[DEBUG] Forecast API Raw Response: {response_forecast.text}")
+            # 디버깅: 실제 응답 텍스트 확인 (DEBUG 레벨일 때만 디코드)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Forecast API Raw Response: %s", response_forecast.text)
 
-        data_forecast = response_forecast.json()
+            data_forecast = orjson.loads(response_forecast.content)
         
-        # 디버깅: 단기예보 API 파라미터 출력
-        print(f"[DEBUG] Forecast params - date: {forecast_date}, time: {forecast_time}")
-        print(f"[DEBUG] Forecast API response keys: {data_forecast.get('response', {}).get('body', {}).get('items', {})}")
+            # 디버깅: 단기예보 API 파라미터 출력
+            logger.debug("Forecast params - date: %s, time: %s", forecast_date, forecast_time)
         
-        if 'response' in data_forecast and 'body' in data_forecast['response']:
-            if 'items' in data_forecast['response']['body'] and 'item' in data_forecast['response']['body']['items']:
-                items_forecast = data_forecast['response']['body']['items']['item']
-                
-                # items가 리스트가 아닌 경우 처리
-                if not isinstance(items_forecast, list):
-                    items_forecast = [items_forecast]
+            if 'response' in data_forecast and 'body' in data_forecast['response']:
+                if 'items' in data_forecast['response']['body'] and 'item' in data_forecast['response']['body']['items']:
+                    items_forecast = data_forecast['response']['body']['items']['item']
                 
-                # 단기예보 데이터 파싱
-                kst = timezone(timedelta(hours=9))
-                today = datetime.now(kst)
-                today_str = today.strftime('%Y%m%d')
-                tomorrow_str = (today + timedelta(days=1)).strftime('%Y%m%d')
+                    # items가 리스트가 아닌 경우 처리
+                    if not isinstance(items_forecast, list):
+                        items_forecast = [items_forecast]
                 
-                # forecast_time이 2300인 경우: 전날 23:00 발표분
-                # 이 경우 API의 fcstDate는 내일(tomorrow)을 가리킴
-                # 따라서 내일 날짜의 TMN/TMX가 실제로는 오늘의 최저/최고 기온
-                target_tmn_date = tomorrow_str if forecast_time == "2300" else today_str
-                target_tmx_date = tomorrow_str if forecast_time == "2300" else today_str
-                
-                # SKY는 시간대별로 다르므로 최신 시간대 선택 (오늘 날짜 우선)
-                sky_time = '0000'
-                sky_date = ''
-                # TMN, TMX는 하루에 한 번만 제공되므로 첫 번째 값 사용
-                tmn_found = False
-                tmx_found = False
-                
-                for item in items_forecast:
-                    fcst_date = item.get('fcstDate', '')
-                    fcst_time = item.get('fcstTime', '0000')
-                    category = item.get('category', '')
-                    
-                    if category == 'SKY': # 하늘상태
-                        # 오늘 또는 내일 날짜 확인
-                        if fcst_date in [today_str, tomorrow_str]:
+                    # 단기예보 데이터 파싱 (엔드포인트 진입 시의 now 재사용)
+                    # 날짜/시각은 정수로 비교 (문자열 비교보다 저렴)
+                    today = now
+                    today_int = int(today.strftime('%Y%m%d'))
+                    tomorrow_int = int((today + timedelta(days=1)).strftime('%Y%m%d'))
+                    target_dates = {today_int, tomorrow_int}
+
+                    # forecast_time이 2300인 경우: 전날 23:00 발표분
+                    # 이 경우 API의 fcstDate는 내일(tomorrow)을 가리킴
+                    # 따라서 내일 날짜의 TMN/TMX가 실제로는 오늘의 최저/최고 기온
+                    target_tmn_date = tomorrow_int if forecast_time == "2300" else today_int
+                    target_tmx_date = target_tmn_date
+
+                    # SKY는 시간대별로 다르므로 최신 시간대 선택 (오늘 날짜 우선)
+                    sky_time = 0
+                    sky_date = 0
+                    # TMN, TMX는 하루에 한 번만 제공되므로 첫 번째 값 사용
+                    tmn_found = False
+                    tmx_found = False
+
+                    for item in items_forecast:
+                        # 관심 없는 카테고리/날짜는 분기 전에 걸러냄
+                        category = item.get('category', '')
+                        if category not in FORECAST_CATEGORIES:
+                            continue
+                        fcst_date = int(item.get('fcstDate', '0'))
+                        if fcst_date not in target_dates:
+                            continue
+                        fcst_time = int(item.get('fcstTime', '0'))
+
+                        if category == 'SKY': # 하늘상태
                             # 오늘 날짜 우선
-                            if fcst_date == today_str:
-                                if fcst_time > sky_time:
+                            if fcst_date == today_int:
+                                if fcst_time > sky_time or sky_date != today_int:
                                     result['sky'] = item['fcstValue']
                                     sky_time = fcst_time
                                     sky_date = fcst_date
-                            elif fcst_date == tomorrow_str:
+                            else:
                                 # 오늘 날짜에 SKY가 없을 때만 내일 날짜 사용
-                                if sky_date == '' or (sky_date == tomorrow_str and fcst_time > sky_time):
+                                if sky_date == 0 or (sky_date == tomorrow_int and fcst_time > sky_time):
                                     result['sky'] = item['fcstValue']
                                     sky_time = fcst_time
                                     sky_date = fcst_date
-                    elif category == 'TMN': # 최저기온
-                        # target_tmn_date와 일치하는 TMN 찾기
-                        if fcst_date == target_tmn_date and not tmn_found:
-                            result['tmn'] = item['fcstValue']
-                            tmn_found = True
-                    elif category == 'TMX': # 최고기온
-                        # target_tmx_date와 일치하는 TMX 찾기
-                        if fcst_date == target_tmx_date and not tmx_found:
-                            result['tmx'] = item['fcstValue']
-                            tmx_found = True
+                        elif category == 'TMN': # 최저기온
+                            # target_tmn_date와 일치하는 TMN 찾기
+                            if fcst_date == target_tmn_date and not tmn_found:
+                                result['tmn'] = item['fcstValue']
+                                tmn_found = True
+                        elif category == 'TMX': # 최고기온
+                            # target_tmx_date와 일치하는 TMX 찾기
+                            if fcst_date == target_tmx_date and not tmx_found:
+                                result['tmx'] = item['fcstValue']
+                                tmx_found = True
+
+                        # 항목은 날짜/시각 오름차순: 오늘 SKY가 확정됐고 TMN/TMX를
+                        # 모두 찾았으면 남은 항목은 볼 필요가 없음
+                        if tmn_found and tmx_found and sky_date == today_int and fcst_date > today_int:
+                            break
                 
-                # 디버깅 로그
-                print(f"[DEBUG] forecast_time={forecast_time}, target_tmn_date={target_tmn_date}, target_tmx_date={target_tmx_date}")
-                if not tmn_found:
-                    print(f"[DEBUG] TMN not found")
-                if not tmx_found:
-                    print(f"[DEBUG] TMX not found. Available candidates: {tmx_candidates}")
+                    # 디버깅 로그
+                    logger.debug("forecast_time=%s, target_tmn_date=%s, target_tmx_date=%s",
+                                 forecast_time, target_tmn_date, target_tmx_date)
+                    if not tmn_found:
+                        logger.debug("TMN not found")
+                    if not tmx_found:
+                        logger.debug("TMX not found")
         
+        except Exception as forecast_err:
+            logger.warning("Forecast parse failed, serving current weather only: %s", forecast_err)
+
         return {
             "status": "success",
-            "campus": campus,
+            "campus": campus_key,
             "checkTime": f"{base_date} {base_time[:2]}",
             "forecastTime": f"{forecast_date} {forecast_time[:2]}",
             "data": result
         }
 
-    except requests.exceptions.HTTPError as http_err:
+    try:
+        # 실황/예보는 기준시각 단위로만 갱신되므로 짧은 TTL로 KMA 호출을 흡수
+        return await _fetch_cached(f"weather:{campus_key}", fetch, ttl=300, stale_ttl=1800)
+    except httpx.HTTPStatusError as http_err:
         return {"status": 'error', "message": f"날씨 API 서버 에러가 발생했습니다: {http_err}"}
     except ValueError:
         # response.json()이 실패하면 ValueError (또는 JSONDecodeError)가 발생합니다.
@@ -622,24 +919,29 @@ def get_weather(campus: str = Query("SEOUL")):
     except Exception as e:
         return {"status": 'error', "message": f"알 수 없는 에러가 발생했습니다: {str(e)}"}
 
+# 시간표 요청 고정 파라미터: 요일(d1~d6)/교시(t1~t12) 기본값 포함, 요청마다 재생성하지 않음
+_TIMETABLE_BASE_PARAMS = {
+    'mName': 'getDataLssnLista',
+    'cName': 'hufs.stu1.STU1_C009',
+    'org_sect': 'A',
+    'won': '', 'cyber': '',
+    **{f"d{i}": "N" for i in range(1, 7)},
+    **{f"t{i}": "N" for i in range(1, 13)}
+}
+
 # 시간표 요청 엔드포인트
 @app.post("/api/timetable")
 async def search_timetable(req: SearchRequest):
+    # 고정 템플릿을 복사한 뒤 요청별 값만 덮어쓰기
     full_params = {
-        'mName': 'getDataLssnLista',
-        'cName': 'hufs.stu1.STU1_C009',
-        'org_sect': 'A',
+        **_TIMETABLE_BASE_PARAMS,
         'ledg_year': req.year,
         'ledg_sessn': req.semester,          # 학기 (1: 1학기, 2: 여름학기, 3: 2학기, 4: 겨울학기)
         'campus': req.campus,                # 캠퍼스 (H1: 서울, H2: 글로벌)
         'crs_strct_cd': req.dept_code,
         'gubun': req.gubun,
         'subjt_nm': req.keyword,
-        'won': '', 'cyber': '', 
-        'emp_nm': req.professor,
-        # 딕셔너리 컴프리헨션으로 d1~d6, t1~t12를 'N'으로 한 번에 생성
-        **{f"d{i}": "N" for i in range(1, 7)},
-        **{f"t{i}": "N" for i in range(1, 13)}
+        'emp_nm': req.professor
         }
 
     # 3. 리액트에서 유저가 선택한 'Y' 값들이 있다면 템플릿에 덮어쓰기
@@ -656,12 +958,17 @@ async def search_timetable(req: SearchRequest):
     }
 
     try:
-        response = requests.post("https://wis.hufs.ac.kr/hufs", data=full_params, headers=headers)
+        response = await http_client.post("https://wis.hufs.ac.kr/hufs", data=full_params,
+                                          headers=headers,
+                                          timeout=httpx.Timeout(10.0, connect=3.0))
         response.raise_for_status()
         
-        # 5. 해독 (URI Decoding -> JSON Parsing)
-        decoded_text = unquote(response.text)
-        data = json.loads(decoded_text)
+        # 5. 해독 (JSON Parsing, 필요 시에만 URI Decoding)
+        # 응답이 이미 유효한 JSON이면 본문 전체를 훑는 unquote를 건너뜀
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            data = json.loads(unquote(response.text))
     
         # 6. 데이터 정제 (리액트가 쓰기 편하게 가공)
         raw_courses = data.get('data', [])
@@ -691,3 +998,9 @@ async def search_timetable(req: SearchRequest):
 def root():
     """API 서버의 상태를 확인하기 위한 기본 엔드포인트"""
     return {"message": "HUFS Clock API is running."}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    # uvicorn[standard] 설치 시 uvloop 이벤트 루프와 httptools HTTP 파서가 자동 선택됨
+    uvicorn.run("index:app", host="0.0.0.0", port=8000)